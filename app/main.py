@@ -5,28 +5,75 @@ Handles file upload, download, and metadata management with S3 and CloudFront
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import RedirectResponse, JSONResponse, ORJSONResponse
+from contextlib import asynccontextmanager
 from typing import List, Optional
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
-from .models.file_models import FileMetadata, FileUploadResponse, FileListResponse
-from .services.s3_service import S3Service
+from .models.file_models import (
+    FileUploadResponse,
+    FileListResponse,
+    UploadInitRequest,
+    UploadInitResponse,
+    BatchDeleteRequest,
+    BatchDeleteResponse
+)
+from .services.cache_service import CacheService
+from .services.s3_service import S3Service, close_s3_client
 from .services.cloudfront_service import CloudFrontService
 from .utils.validators import validate_file_type, validate_file_size
 from .utils.config import get_settings
+from .utils.middleware import HEALTH_RESPONSE, HealthCheckMiddleware, MaxBodySizeMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Lifetime of presigned upload URLs (seconds)
+UPLOAD_URL_EXPIRATION = 900
+
+# Allowance for multipart boundaries and form fields around the file body
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Initialize services
+settings = get_settings()
+cache_service = CacheService()
+s3_service = S3Service(cache=cache_service)
+cloudfront_service = CloudFrontService()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open long-lived AWS and Redis clients on startup and close them on shutdown"""
+    await s3_service.connect()
+    try:
+        yield
+    finally:
+        s3_service.close()
+        await close_s3_client()
+        await cache_service.close()
+        cloudfront_service.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="File Service",
     description="Microservice for file upload, download and management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Reject oversize uploads from Content-Length before any body is buffered
+# (added before CORS so 413 responses still carry CORS headers)
+app.add_middleware(
+    MaxBodySizeMiddleware,
+    max_body_size=settings.max_file_size + MULTIPART_OVERHEAD,
+    paths=["/upload"]
 )
 
 # CORS middleware
@@ -38,16 +85,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-settings = get_settings()
-s3_service = S3Service()
-cloudfront_service = CloudFrontService()
+# Compress larger JSON responses such as /files listings
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Added last so health probes are answered before CORS and routing
+app.add_middleware(HealthCheckMiddleware, path="/health")
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    """Health check endpoint (normally served by HealthCheckMiddleware)"""
+    return HEALTH_RESPONSE
 
 
 @app.post("/upload", response_model=FileUploadResponse)
@@ -66,31 +114,23 @@ async def upload_file(
         if not validate_file_size(file.size):
             raise HTTPException(status_code=400, detail="File size exceeds limit")
 
-        # Generate unique file ID
-        file_id = str(uuid.uuid4())
-
-        # Create file metadata
-        file_metadata = FileMetadata(
-            id=file_id,
-            original_name=file.filename,
-            content_type=file.content_type,
-            size=file.size,
-            folder=folder,
-            uploaded_at=datetime.utcnow()
-        )
+        # Generate unique file ID (hex form skips dash formatting)
+        file_id = uuid.uuid4().hex
+        uploaded_at = datetime.now(timezone.utc)
 
         # Upload to S3
         s3_key = await s3_service.upload_file(
             file=file,
             file_id=file_id,
-            folder=folder
+            folder=folder,
+            uploaded_at=uploaded_at.isoformat()
         )
 
         # Generate CloudFront URL
         cloudfront_url = cloudfront_service.get_file_url(s3_key)
 
         # Store metadata (in a real app, you'd save to database)
-        logger.info(f"File uploaded successfully: {file_id}")
+        logger.debug("File uploaded successfully: %s", file_id)
 
         return FileUploadResponse(
             file_id=file_id,
@@ -99,16 +139,66 @@ async def upload_file(
             content_type=file.content_type,
             s3_key=s3_key,
             cloudfront_url=cloudfront_url,
-            uploaded_at=file_metadata.uploaded_at
+            uploaded_at=uploaded_at
         )
 
     except Exception as e:
-        logger.error(f"Error uploading file: {str(e)}")
+        logger.error("Error uploading file: %s", e)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+@app.post("/upload/init", response_model=UploadInitResponse)
+async def init_upload(request: UploadInitRequest):
+    """
+    Issue a presigned POST so the client uploads directly to S3
+
+    The client sends a multipart/form-data POST to upload_url containing
+    every entry of upload_fields followed by the file as the "file" field.
+    """
+    try:
+        # Validate file
+        if not validate_file_type(request.filename):
+            raise HTTPException(status_code=400, detail="File type not allowed")
+
+        if not validate_file_size(request.size):
+            raise HTTPException(status_code=400, detail="File size exceeds limit")
+
+        file_id = uuid.uuid4().hex
+        uploaded_at = datetime.now(timezone.utc)
+        s3_key = s3_service.build_s3_key(file_id, request.folder)
+
+        # The declared size is only a hint; S3 enforces the size limit itself
+        upload = await s3_service.generate_presigned_upload(
+            s3_key,
+            max_size=settings.max_file_size,
+            file_id=file_id,
+            original_name=request.filename,
+            uploaded_at=uploaded_at.isoformat(),
+            content_type=request.content_type,
+            expiration=UPLOAD_URL_EXPIRATION
+        )
+
+        return UploadInitResponse(
+            file_id=file_id,
+            s3_key=s3_key,
+            upload_url=upload['url'],
+            upload_fields=upload['fields'],
+            cloudfront_url=cloudfront_service.get_file_url(s3_key),
+            expires_in=UPLOAD_URL_EXPIRATION
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error initializing upload: %s", e)
+        raise HTTPException(status_code=500, detail="Upload initialization failed")
+
+
 @app.get("/download/{file_id}")
-async def download_file(file_id: str):
+async def download_file(
+    file_id: str,
+    verify: bool = Query(False, description="Check the file exists in S3 before redirecting")
+):
     """
     Redirect to CloudFront URL for file download
     """
@@ -117,20 +207,18 @@ async def download_file(file_id: str):
         # For now, we'll construct the S3 key from file_id
         s3_key = f"files/{file_id}"
 
-        # Check if file exists in S3
-        if not await s3_service.file_exists(s3_key):
+        # CloudFront already answers 403/404 for missing objects, so the
+        # S3 round-trip is only made when explicitly requested
+        if verify and not await s3_service.file_exists(s3_key):
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Generate CloudFront URL
-        cloudfront_url = cloudfront_service.get_file_url(s3_key)
-
         # Redirect to CloudFront
-        return RedirectResponse(url=cloudfront_url)
+        return RedirectResponse(url=cloudfront_service.get_file_url(s3_key))
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error downloading file {file_id}: {str(e)}")
+        logger.error("Error downloading file %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Download failed")
 
 
@@ -156,7 +244,7 @@ async def list_files(
         )
 
     except Exception as e:
-        logger.error(f"Error listing files: {str(e)}")
+        logger.error("Error listing files: %s", e)
         raise HTTPException(status_code=500, detail="Failed to list files")
 
 
@@ -178,16 +266,52 @@ async def delete_file(file_id: str):
 
         # In a real app, you'd also delete from database
 
-        logger.info(f"File deleted successfully: {file_id}")
+        logger.info("File deleted successfully: %s", file_id)
         return {"message": "File deleted successfully", "file_id": file_id}
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting file {file_id}: {str(e)}")
+        logger.error("Error deleting file %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Delete failed")
 
 
+@app.post("/files/batch-delete", response_model=BatchDeleteResponse)
+async def batch_delete_files(request: BatchDeleteRequest):
+    """
+    Delete several files from S3 in as few requests as possible
+
+    Unlike DELETE /files/{file_id}, missing files are not reported as 404:
+    S3 treats deleting a missing key as a success, so those IDs are listed
+    under "deleted". Only IDs S3 returned an error for are listed under "failed".
+    """
+    try:
+        # In a real app, you'd fetch from database first
+        s3_keys = [f"files/{file_id}" for file_id in request.file_ids]
+
+        failed_keys = set(await s3_service.delete_files(s3_keys))
+
+        deleted = [
+            file_id for file_id, s3_key in zip(request.file_ids, s3_keys)
+            if s3_key not in failed_keys
+        ]
+        failed = [
+            file_id for file_id, s3_key in zip(request.file_ids, s3_keys)
+            if s3_key in failed_keys
+        ]
+
+        logger.info("Batch delete: %d deleted, %d failed", len(deleted), len(failed))
+        return BatchDeleteResponse(
+            message="Batch delete completed",
+            deleted=deleted,
+            failed=failed
+        )
+
+    except Exception as e:
+        logger.error("Error batch deleting files: %s", e)
+        raise HTTPException(status_code=500, detail="Batch delete failed")
+
+
 @app.get("/files/{file_id}/metadata")
 async def get_file_metadata(file_id: str):
     """
@@ -208,7 +332,7 @@ async def get_file_metadata(file_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting metadata for file {file_id}: {str(e)}")
+        logger.error("Error getting metadata for file %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Failed to get metadata")
 
 if __name__ == "__main__":
@@ -2,13 +2,15 @@
 Data models for file operations
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
 
 class FileMetadata(BaseModel):
     """File metadata model"""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     original_name: str
     content_type: Optional[str] = None
@@ -21,6 +23,8 @@ class FileMetadata(BaseModel):
 
 class FileUploadResponse(BaseModel):
     """Response model for file upload"""
+    model_config = ConfigDict(frozen=True)
+
     file_id: str
     filename: str
     size: int
@@ -30,8 +34,30 @@ class FileUploadResponse(BaseModel):
     uploaded_at: datetime
 
 
+class UploadInitRequest(BaseModel):
+    """Request model for direct-to-S3 upload initialization"""
+    filename: str
+    content_type: Optional[str] = None
+    size: int = Field(..., gt=0)
+    folder: Optional[str] = None
+
+
+class UploadInitResponse(BaseModel):
+    """Response model for direct-to-S3 upload initialization"""
+    model_config = ConfigDict(frozen=True)
+
+    file_id: str
+    s3_key: str
+    upload_url: str
+    upload_fields: dict[str, str]
+    cloudfront_url: str
+    expires_in: int
+
+
 class FileListResponse(BaseModel):
     """Response model for file listing"""
+    model_config = ConfigDict(frozen=True)
+
     files: list[FileMetadata]
     total: int
     limit: int
@@ -40,6 +66,26 @@ class FileListResponse(BaseModel):
 
 class FileDeleteResponse(BaseModel):
     """Response model for file deletion"""
+    model_config = ConfigDict(frozen=True)
+
     message: str
     file_id: str
 
+
+class BatchDeleteRequest(BaseModel):
+    """Request model for batch file deletion"""
+    # Capped at one delete_objects call's worth of keys per request
+    file_ids: list[str] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchDeleteResponse(BaseModel):
+    """Response model for batch file deletion"""
+    model_config = ConfigDict(frozen=True)
+
+    message: str
+    deleted: list[str] = Field(
+        ...,
+        description="IDs S3 reported no error for, including IDs that did not exist"
+    )
+    failed: list[str]
+
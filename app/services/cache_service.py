@@ -0,0 +1,106 @@
+"""
+Redis cache service for file existence and metadata lookups
+"""
+
+import logging
+from typing import Optional
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from ..utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheService:
+    """Service for Redis cache operations"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.ttl = self.settings.cache_ttl
+
+        # Caching is disabled when no Redis URL is configured
+        self._redis = None
+        if self.settings.redis_url:
+            self._redis = aioredis.from_url(
+                self.settings.redis_url,
+                decode_responses=True
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis backend is configured"""
+        return self._redis is not None
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss or cache error
+        """
+        if self._redis is None:
+            return None
+
+        try:
+            return await self._redis.get(key)
+        except RedisError as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+
+    async def exists(self, key: str) -> bool:
+        """
+        Check if a key is cached
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key is cached, False on miss or cache error
+        """
+        if self._redis is None:
+            return False
+
+        try:
+            return bool(await self._redis.exists(key))
+        except RedisError as e:
+            logger.warning("Cache exists failed for %s: %s", key, e)
+            return False
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Cache a value with the configured TTL
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self._redis is None:
+            return
+
+        try:
+            await self._redis.setex(key, self.ttl, value)
+        except RedisError as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Remove keys from the cache
+
+        Args:
+            keys: Cache keys to remove
+        """
+        if self._redis is None or not keys:
+            return
+
+        try:
+            await self._redis.delete(*keys)
+        except RedisError as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.aclose()
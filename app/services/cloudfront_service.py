@@ -2,12 +2,25 @@
 CloudFront service for file URL generation
 """
 
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
+from botocore.signers import CloudFrontSigner
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
 from ..utils.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of file URLs and signed URLs kept in memory
+FILE_URL_CACHE_SIZE = 10000
+SIGNED_URL_CACHE_SIZE = 10000
+
 
 class CloudFrontService:
     """Service for CloudFront operations"""
@@ -16,6 +29,73 @@ class CloudFrontService:
         self.settings = get_settings()
         self.cloudfront_domain = self.settings.cloudfront_domain
 
+        # Precompute the URL prefix once instead of on every request
+        if self.cloudfront_domain:
+            self._url_prefix = f"https://{self.cloudfront_domain}/"
+        else:
+            logger.warning("CloudFront domain not configured, using S3 URL")
+            self._url_prefix = (
+                f"https://{self.settings.s3_bucket_name}"
+                f".s3.{self.settings.aws_region}.amazonaws.com/"
+            )
+
+        # Per-instance cache (lru_cache on the method itself would pin self)
+        self._cached_file_url = lru_cache(maxsize=FILE_URL_CACHE_SIZE)(self._build_file_url)
+
+        # Parse the private key once; loading the PEM per call dominates signing cost
+        self._signer: Optional[CloudFrontSigner] = None
+        if self.settings.cloudfront_key_pair_id and self.settings.cloudfront_private_key_path:
+            with open(self.settings.cloudfront_private_key_path, 'rb') as key_file:
+                self._private_key = serialization.load_pem_private_key(
+                    key_file.read(),
+                    password=None
+                )
+            self._signer = CloudFrontSigner(
+                self.settings.cloudfront_key_pair_id,
+                self._rsa_sign
+            )
+
+        # Per-instance cache so URLs signed within the same minute are shared
+        self._cached_signed_url = lru_cache(maxsize=SIGNED_URL_CACHE_SIZE)(self._sign_url)
+
+        # RSA signing is CPU-bound; cryptography releases the GIL while signing
+        self._signer_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count(),
+            thread_name_prefix="cloudfront-signer"
+        )
+
+    def close(self) -> None:
+        """Shut down the signing thread pool"""
+        self._signer_pool.shutdown(wait=False)
+
+    def _rsa_sign(self, message: bytes) -> bytes:
+        """Sign a CloudFront policy with the configured private key"""
+        return self._private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+
+    def _sign_url(self, s3_key: str, expiration_bucket: int) -> str:
+        """
+        Sign a CloudFront URL expiring at the end of the given minute
+
+        Args:
+            s3_key: S3 object key
+            expiration_bucket: Expiry time in minutes since the epoch
+
+        Returns:
+            Signed CloudFront URL
+        """
+        date_less_than = datetime.fromtimestamp(
+            (expiration_bucket + 1) * 60,
+            tz=timezone.utc
+        )
+        return self._signer.generate_presigned_url(
+            self.get_file_url(s3_key),
+            date_less_than=date_less_than
+        )
+
+    def _build_file_url(self, s3_key: str) -> str:
+        """Concatenate the URL prefix and S3 key"""
+        return self._url_prefix + s3_key.lstrip('/')
+
     def get_file_url(self, s3_key: str) -> str:
         """
         Generate CloudFront URL for a file
@@ -26,20 +106,12 @@ class CloudFrontService:
         Returns:
             CloudFront URL for the file
         """
-        if not self.cloudfront_domain:
-            logger.warning("CloudFront domain not configured, using S3 URL")
-            return f"https://{self.settings.s3_bucket_name}.s3.{self.settings.aws_region}.amazonaws.com/{s3_key}"
-
-        # Remove leading slash if present
-        s3_key = s3_key.lstrip('/')
+        cloudfront_url = self._cached_file_url(s3_key)
 
-        # Construct CloudFront URL
-        cloudfront_url = f"https://{self.cloudfront_domain}/{s3_key}"
-
-        logger.info(f"Generated CloudFront URL: {cloudfront_url}")
+        logger.debug("Generated CloudFront URL: %s", cloudfront_url)
         return cloudfront_url
 
-    def get_signed_url(
+    async def get_signed_url(
         self,
         s3_key: str,
         expiration: int = 3600
@@ -54,7 +126,15 @@ class CloudFrontService:
         Returns:
             Signed CloudFront URL
         """
-        # This would require CloudFront key pair configuration
-        # For now, return regular CloudFront URL
-        logger.warning("Signed URLs not implemented, returning regular URL")
-        return self.get_file_url(s3_key)
+        if self._signer is None:
+            logger.warning("CloudFront key pair not configured, returning regular URL")
+            return self.get_file_url(s3_key)
+
+        # Round the expiry up to the minute so concurrent clients share a URL
+        expiration_bucket = (int(time.time()) + expiration) // 60
+        return await asyncio.get_running_loop().run_in_executor(
+            self._signer_pool,
+            self._cached_signed_url,
+            s3_key,
+            expiration_bucket
+        )
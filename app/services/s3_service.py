@@ -2,29 +2,137 @@
 S3 service for file operations
 """
 
-import boto3
+import aioboto3
+import json
 import logging
+from contextlib import AsyncExitStack
 from typing import Optional, Dict, Any
 from fastapi import UploadFile
+from aiobotocore.config import AioConfig
 from botocore.exceptions import ClientError, NoCredentialsError
+from .cache_service import CacheService
 from ..utils.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Part size for streamed multipart uploads (S3 minimum is 5MB)
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Maximum number of keys accepted by a single delete_objects call
+DELETE_BATCH_SIZE = 1000
+
+
+# Shared client configuration: a larger pool avoids "Connection pool is full"
+# discards (and the TLS handshakes that follow) under concurrent load, and
+# idle connections are kept open longer than aiohttp's 15s default.
+# botocore's tcp_keepalive is not used: aiobotocore ignores socket_options.
+_S3_CLIENT_CONFIG = AioConfig(
+    max_pool_connections=100,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    connector_args={'keepalive_timeout': 60}
+)
+
+# Process-wide S3 client, opened once and shared by every S3Service
+_S3_SESSION = aioboto3.Session()
+_S3_CLIENT = None
+_S3_EXIT_STACK: Optional[AsyncExitStack] = None
+
+
+async def _get_s3_client():
+    """Open the shared S3 client on first use and return it"""
+    global _S3_CLIENT, _S3_EXIT_STACK
+
+    if _S3_CLIENT is None:
+        _S3_EXIT_STACK = AsyncExitStack()
+        _S3_CLIENT = await _S3_EXIT_STACK.enter_async_context(
+            _S3_SESSION.client(
+                's3',
+                region_name=get_settings().aws_region,
+                config=_S3_CLIENT_CONFIG
+            )
+        )
+    return _S3_CLIENT
+
+
+async def close_s3_client() -> None:
+    """
+    Close the shared S3 client and release pooled connections
+
+    Called once at application shutdown, after every S3Service is closed.
+    """
+    global _S3_CLIENT, _S3_EXIT_STACK
+
+    if _S3_EXIT_STACK is not None:
+        await _S3_EXIT_STACK.aclose()
+    _S3_CLIENT = None
+    _S3_EXIT_STACK = None
+
+
+def _object_metadata(
+    original_name: Optional[str],
+    file_id: str,
+    uploaded_at: Optional[str]
+) -> Dict[str, str]:
+    """User metadata stored on every uploaded object, whichever path uploads it"""
+    return {
+        'original_name': original_name or '',
+        'file_id': file_id,
+        'uploaded_at': uploaded_at or ''
+    }
+
+
+def _exists_cache_key(s3_key: str) -> str:
+    return f"file:{s3_key}"
+
+
+def _metadata_cache_key(s3_key: str) -> str:
+    return f"metadata:{s3_key}"
+
 
 class S3Service:
     """Service for S3 operations"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[CacheService] = None):
         self.settings = get_settings()
-        self.s3_client = boto3.client('s3')
         self.bucket_name = self.settings.s3_bucket_name
+        self.cache = cache or CacheService()
+        self._client = None
+
+    async def connect(self) -> None:
+        """
+        Bind the shared long-lived S3 client
+
+        Called once at application startup so that TCP/TLS connections
+        are pooled and reused across requests.
+        """
+        self._client = await _get_s3_client()
+
+    def close(self) -> None:
+        """Unbind the shared S3 client (see close_s3_client to shut it down)"""
+        self._client = None
+
+    @staticmethod
+    def build_s3_key(file_id: str, folder: Optional[str] = None) -> str:
+        """
+        Construct the S3 key for a file
+
+        Args:
+            file_id: Unique file identifier
+            folder: Optional folder path in S3
+
+        Returns:
+            S3 object key
+        """
+        if folder:
+            return f"{folder}/{file_id}"
+        return f"files/{file_id}"
 
     async def upload_file(
         self,
         file: UploadFile,
         file_id: str,
-        folder: Optional[str] = None
+        folder: Optional[str] = None,
+        uploaded_at: Optional[str] = None
     ) -> str:
         """
         Upload file to S3 bucket
@@ -33,46 +141,100 @@ class S3Service:
             file: FastAPI UploadFile object
             file_id: Unique file identifier
             folder: Optional folder path in S3
+            uploaded_at: ISO-8601 upload timestamp stored in object metadata
 
         Returns:
             S3 key of uploaded file
         """
         try:
-            # Construct S3 key
-            if folder:
-                s3_key = f"{folder}/{file_id}"
-            else:
-                s3_key = f"files/{file_id}"
+            s3_key = self.build_s3_key(file_id, folder)
 
-            # Read file content
-            file_content = await file.read()
+            extra_args = {
+                'ContentType': file.content_type,
+                'Metadata': _object_metadata(file.filename, file_id, uploaded_at)
+            }
 
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                ContentType=file.content_type,
-                Metadata={
-                    'original_name': file.filename,
-                    'file_id': file_id,
-                    'uploaded_at': str(file.uploaded_at) if hasattr(file, 'uploaded_at') else ''
-                }
-            )
+            # Stream the body in fixed-size parts so memory stays bounded
+            first_chunk = await file.read(MULTIPART_CHUNK_SIZE)
+            if len(first_chunk) < MULTIPART_CHUNK_SIZE:
+                # Small file: a single PUT is cheaper than a multipart upload
+                await self._client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=first_chunk,
+                    **extra_args
+                )
+            else:
+                await self._multipart_upload(file, s3_key, first_chunk, extra_args)
 
-            logger.info(f"File uploaded to S3: {s3_key}")
+            logger.debug("File uploaded to S3: %s", s3_key)
             return s3_key
 
         except NoCredentialsError:
             logger.error("AWS credentials not found")
             raise Exception("AWS credentials not configured")
         except ClientError as e:
-            logger.error(f"S3 upload error: {str(e)}")
+            logger.error("S3 upload error: %s", e)
             raise Exception(f"Failed to upload file to S3: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error during upload: {str(e)}")
+            logger.error("Unexpected error during upload: %s", e)
             raise Exception(f"Upload failed: {str(e)}")
 
+    async def _multipart_upload(
+        self,
+        file: UploadFile,
+        s3_key: str,
+        first_chunk: bytes,
+        extra_args: Dict[str, Any]
+    ) -> None:
+        """
+        Upload file to S3 part by part, holding at most one chunk in memory
+
+        Args:
+            file: FastAPI UploadFile object
+            s3_key: S3 object key
+            first_chunk: Chunk already read from the file
+            extra_args: ContentType and Metadata for the object
+        """
+        upload = await self._client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            **extra_args
+        )
+        upload_id = upload['UploadId']
+
+        try:
+            parts = []
+            chunk = first_chunk
+            part_number = 1
+            while chunk:
+                response = await self._client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk
+                )
+                parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                part_number += 1
+                chunk = await file.read(MULTIPART_CHUNK_SIZE)
+
+            await self._client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+
+        except Exception:
+            # Don't leave orphaned parts billed in the bucket
+            await self._client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id
+            )
+            raise
+
     async def file_exists(self, s3_key: str) -> bool:
         """
         Check if file exists in S3
@@ -83,14 +245,32 @@ class S3Service:
         Returns:
             True if file exists, False otherwise
         """
-        try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        cache_key = _exists_cache_key(s3_key)
+        if await self.cache.exists(cache_key):
             return True
+
+        try:
+            # A listing answers "missing" with a normal response, whereas
+            # head_object raises (and builds) a ClientError on every 404
+            response = await self._client.list_objects_v2(
+                Bucket=self.bucket_name,
+                Prefix=s3_key,
+                MaxKeys=1
+            )
         except ClientError as e:
-            if e.response['Error']['Code'] == '404':
-                return False
+            if e.response['Error']['Code'] == 'AccessDenied':
+                logger.error("Missing s3:ListBucket permission on bucket %s", self.bucket_name)
+                raise Exception(
+                    f"S3 access denied listing bucket {self.bucket_name}: "
+                    "the service role needs s3:ListBucket to check file existence"
+                )
             raise Exception(f"Error checking file existence: {str(e)}")
 
+        exists = any(obj['Key'] == s3_key for obj in response.get('Contents', []))
+        if exists:
+            await self.cache.set(cache_key, "1")
+        return exists
+
     async def get_file_metadata(self, s3_key: str) -> Dict[str, Any]:
         """
         Get file metadata from S3
@@ -101,19 +281,29 @@ class S3Service:
         Returns:
             Dictionary containing file metadata
         """
+        cache_key = _metadata_cache_key(s3_key)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
         try:
-            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            response = await self._client.head_object(Bucket=self.bucket_name, Key=s3_key)
 
-            return {
+            last_modified = response.get('LastModified')
+            metadata = {
                 's3_key': s3_key,
                 'content_type': response.get('ContentType'),
                 'size': response.get('ContentLength'),
-                'last_modified': response.get('LastModified'),
+                'last_modified': last_modified.isoformat() if last_modified else None,
                 'metadata': response.get('Metadata', {})
             }
 
+            await self.cache.set(cache_key, json.dumps(metadata))
+            await self.cache.set(_exists_cache_key(s3_key), "1")
+            return metadata
+
         except ClientError as e:
-            logger.error(f"Error getting file metadata: {str(e)}")
+            logger.error("Error getting file metadata: %s", e)
             raise Exception(f"Failed to get file metadata: {str(e)}")
 
     async def delete_file(self, s3_key: str) -> bool:
@@ -127,14 +317,57 @@ class S3Service:
             True if deletion successful
         """
         try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
-            logger.info(f"File deleted from S3: {s3_key}")
+            await self._client.delete_object(Bucket=self.bucket_name, Key=s3_key)
+            await self.cache.delete(
+                _exists_cache_key(s3_key),
+                _metadata_cache_key(s3_key)
+            )
+            logger.info("File deleted from S3: %s", s3_key)
             return True
 
         except ClientError as e:
-            logger.error(f"Error deleting file: {str(e)}")
+            logger.error("Error deleting file: %s", e)
             raise Exception(f"Failed to delete file: {str(e)}")
 
+    async def delete_files(self, s3_keys: list[str]) -> list[str]:
+        """
+        Delete files from S3 in batches of up to 1000 keys per request
+
+        Args:
+            s3_keys: S3 object keys
+
+        Returns:
+            S3 keys that could not be deleted
+        """
+        failed = []
+        for start in range(0, len(s3_keys), DELETE_BATCH_SIZE):
+            chunk = s3_keys[start:start + DELETE_BATCH_SIZE]
+            try:
+                response = await self._client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': key} for key in chunk],
+                        'Quiet': True
+                    }
+                )
+            except ClientError as e:
+                # Earlier chunks are already deleted; report this one as failed
+                logger.error("Error batch deleting files: %s", e)
+                failed.extend(chunk)
+                continue
+
+            # Invalidate right away so a later failure can't leave stale entries
+            await self.cache.delete(
+                *(_exists_cache_key(key) for key in chunk),
+                *(_metadata_cache_key(key) for key in chunk)
+            )
+
+            # Quiet mode only reports the keys that failed
+            failed.extend(error['Key'] for error in response.get('Errors', []))
+
+        logger.info("Batch deleted %d files from S3", len(s3_keys) - len(failed))
+        return failed
+
     async def generate_presigned_url(
         self,
         s3_key: str,
@@ -151,7 +384,7 @@ class S3Service:
             Presigned URL
         """
         try:
-            url = self.s3_client.generate_presigned_url(
+            url = await self._client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': s3_key},
                 ExpiresIn=expiration
@@ -159,9 +392,62 @@ class S3Service:
             return url
 
         except ClientError as e:
-            logger.error(f"Error generating presigned URL: {str(e)}")
+            logger.error("Error generating presigned URL: %s", e)
             raise Exception(f"Failed to generate presigned URL: {str(e)}")
 
+    async def generate_presigned_upload(
+        self,
+        s3_key: str,
+        max_size: int,
+        file_id: str,
+        original_name: Optional[str] = None,
+        uploaded_at: Optional[str] = None,
+        content_type: Optional[str] = None,
+        expiration: int = 3600
+    ) -> Dict[str, Any]:
+        """
+        Generate presigned POST for a direct-to-S3 upload
+
+        S3 enforces the size limit through the policy's content-length-range
+        condition, so the client cannot exceed it regardless of what it declared.
+        The same object metadata as upload_file is signed into the policy as
+        x-amz-meta-* fields, which the client must submit unchanged.
+
+        Args:
+            s3_key: S3 object key
+            max_size: Maximum accepted object size in bytes
+            file_id: Unique file identifier
+            original_name: Original filename stored in object metadata
+            uploaded_at: ISO-8601 upload timestamp stored in object metadata
+            content_type: Content type the client must send
+            expiration: Policy expiration time in seconds
+
+        Returns:
+            Dictionary with the upload 'url' and the form 'fields' to submit
+        """
+        try:
+            fields = {
+                f'x-amz-meta-{name}': value
+                for name, value in _object_metadata(original_name, file_id, uploaded_at).items()
+            }
+            if content_type:
+                fields['Content-Type'] = content_type
+
+            conditions = [["content-length-range", 1, max_size]]
+            conditions.extend({name: value} for name, value in fields.items())
+
+            return await self._client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Fields=fields,
+                Conditions=conditions,
+                ExpiresIn=expiration
+            )
+
+        except ClientError as e:
+            logger.error("Error generating presigned upload: %s", e)
+            raise Exception(f"Failed to generate presigned upload: {str(e)}")
+
     async def list_files(
         self,
         prefix: str = "files/",
@@ -178,7 +464,7 @@ class S3Service:
             List of file metadata dictionaries
         """
         try:
-            response = self.s3_client.list_objects_v2(
+            response = await self._client.list_objects_v2(
                 Bucket=self.bucket_name,
                 Prefix=prefix,
                 MaxKeys=max_keys
@@ -197,5 +483,5 @@ class S3Service:
             return files
 
         except ClientError as e:
-            logger.error(f"Error listing files: {str(e)}")
+            logger.error("Error listing files: %s", e)
             raise Exception(f"Failed to list files: {str(e)}")
@@ -2,36 +2,41 @@
 Configuration management
 """
 
-import os
 from functools import lru_cache
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    """Application settings"""
+    """Application settings (each field is read from the matching env var)"""
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
+
+    # AWS Configuration
+    aws_region: str = "us-east-1"
 
     # S3 Configuration
-    s3_bucket_name: str = os.getenv("S3_BUCKET_NAME", "")
+    s3_bucket_name: str = ""
 
     # CloudFront Configuration
-    cloudfront_domain: str = os.getenv("CLOUDFRONT_DOMAIN", "")
+    cloudfront_domain: str = ""
+    cloudfront_key_pair_id: str = ""
+    cloudfront_private_key_path: str = ""
 
     # Application Configuration
     app_name: str = "file-service"
     app_version: str = "1.0.0"
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    debug: bool = False
 
     # File Upload Configuration
-    max_file_size: int = int(os.getenv("MAX_FILE_SIZE", "104857600"))  # 100MB
-    allowed_file_types: str = os.getenv("ALLOWED_FILE_TYPES",
-                                        "image,document,spreadsheet,presentation,archive,video,audio,code")
+    max_file_size: int = 104857600  # 100MB
+    allowed_file_types: str = "image,document,spreadsheet,presentation,archive,video,audio,code"
 
-    # Database Configuration (for future use)
-    database_url: str = os.getenv("DATABASE_URL", "")
+    # Cache Configuration (caching is disabled when REDIS_URL is empty)
+    redis_url: str = ""
+    cache_ttl: int = 3600  # 1 hour
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    # Database Configuration (for future use)
+    database_url: str = ""
 
 
 @lru_cache()
@@ -0,0 +1,66 @@
+"""
+ASGI middleware
+"""
+
+from typing import Iterable
+from starlette.datastructures import Headers
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Static health payload, built once and reused for every probe
+HEALTH_RESPONSE = ORJSONResponse({"status": "healthy"})
+
+PAYLOAD_TOO_LARGE_RESPONSE = ORJSONResponse(
+    {"detail": "File size exceeds limit"},
+    status_code=413
+)
+
+
+class HealthCheckMiddleware:
+    """
+    Answer health probes before the rest of the middleware stack
+
+    Must be added last so it wraps every other middleware (CORS, etc.).
+    """
+
+    def __init__(self, app: ASGIApp, path: str = "/health"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["path"] == self.path
+            and scope["method"] in ("GET", "HEAD")
+        ):
+            await HEALTH_RESPONSE(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+class MaxBodySizeMiddleware:
+    """
+    Reject requests whose Content-Length exceeds a limit before the body is read
+
+    FastAPI parses form bodies before running dependencies, so this check
+    has to happen at the ASGI layer to avoid buffering oversize uploads.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, paths: Iterable[str]):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            content_length = Headers(scope=scope).get("content-length")
+            if (
+                content_length is not None
+                and content_length.isdigit()
+                and int(content_length) > self.max_body_size
+            ):
+                await PAYLOAD_TOO_LARGE_RESPONSE(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
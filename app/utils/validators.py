@@ -2,8 +2,8 @@
 File validation utilities
 """
 
-import os
 from typing import Optional
+from .config import get_settings
 
 # Allowed file types (extensions)
 ALLOWED_EXTENSIONS = {
@@ -17,8 +17,33 @@ ALLOWED_EXTENSIONS = {
     'code': ['.py', '.js', '.html', '.css', '.json', '.xml', '.yaml', '.yml']
 }
 
-# Maximum file size (in bytes) - 100MB
-MAX_FILE_SIZE = 100 * 1024 * 1024
+# Flat lookups precomputed at import time for O(1) checks per upload
+_ALL_EXTENSIONS = frozenset(
+    ext for extensions in ALLOWED_EXTENSIONS.values() for ext in extensions
+)
+_EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in ALLOWED_EXTENSIONS.items()
+    for ext in extensions
+}
+
+# Maximum file size (in bytes) - MAX_FILE_SIZE env var, 100MB by default
+MAX_FILE_SIZE = get_settings().max_file_size
+
+
+def _get_extension(filename: str) -> str:
+    """
+    Get the lowercased file extension, including the dot
+
+    Args:
+        filename: Name of the file
+
+    Returns:
+        Extension such as '.jpg', or '' if there is none
+    """
+    dot = filename.rfind('.')
+    # dot == 0 is a dotfile like '.env', which has no extension
+    return filename[dot:].lower() if dot > 0 else ''
 
 
 def validate_file_type(filename: Optional[str]) -> bool:
@@ -34,15 +59,7 @@ def validate_file_type(filename: Optional[str]) -> bool:
     if not filename:
         return False
 
-    # Get file extension
-    _, ext = os.path.splitext(filename.lower())
-
-    # Check if extension is in any allowed category
-    for category, extensions in ALLOWED_EXTENSIONS.items():
-        if ext in extensions:
-            return True
-
-    return False
+    return _get_extension(filename) in _ALL_EXTENSIONS
 
 
 def validate_file_size(file_size: Optional[int]) -> bool:
@@ -74,13 +91,7 @@ def get_file_category(filename: str) -> Optional[str]:
     if not filename:
         return None
 
-    _, ext = os.path.splitext(filename.lower())
-
-    for category, extensions in ALLOWED_EXTENSIONS.items():
-        if ext in extensions:
-            return category
-
-    return None
+    return _EXT_TO_CATEGORY.get(_get_extension(filename))
 
 
 def is_image_file(filename: str) -> bool: